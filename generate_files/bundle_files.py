@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 from pathlib import Path
-import sys, os, fnmatch
-from typing import List, Dict, Iterable
+import sys, os, re, fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import List, Dict, Iterable, Iterator, Optional
 
 # =========================
 # Konfiguration
@@ -13,22 +17,24 @@ TREE_ONLY = False
 TREE_OUTPUT_FILE = Path(__file__).parent.resolve() / "generated" / "tree.txt"
 TREE_INCLUDE_ALL_FILES_EXCEPT_EXCLUDES = True
 
-EXTENSIONS = {
-    ".cs",
-    ".ts",
-    ".html",
-    ".json",
-    ".yaml",
-    ".yml",
-    ".css",
-    ".md",
-    ".svelte",
-    ".js",
-    ".txt",
-    ".scss",
-    ".cjs",
-    ".mjs",
-}
+EXTENSIONS = frozenset(
+    {
+        ".cs",
+        ".ts",
+        ".html",
+        ".json",
+        ".yaml",
+        ".yml",
+        ".css",
+        ".md",
+        ".svelte",
+        ".js",
+        ".txt",
+        ".scss",
+        ".cjs",
+        ".mjs",
+    }
+)
 
 EXCLUDE_PATTERNS = [
     "tmp",
@@ -51,7 +57,7 @@ EXCLUDE_PATTERNS = [
     "Tests",
 ]
 
-EXCLUDE_FILES = ["package-lock.json", ".gitignore", "package.json", "package-lock.json"]
+EXCLUDE_FILES = frozenset({"package-lock.json", ".gitignore", "package.json"})
 
 # Positivliste: Leer = alles zulassen
 INCLUDE_PATTERNS: List[str] = [
@@ -82,12 +88,14 @@ _LEVELS = {"ERROR": 40, "WARN": 30, "INFO": 20, "DEBUG": 10}
 _ICONS = {"ERROR": "✖", "WARN": "⚠", "INFO": "ℹ", "DEBUG": "·", "OK": "✔", "ARROW": "→"}
 
 
-def _lvl() -> int:
-    return _LEVELS.get(LOG_LEVEL, 20)
+_LEVEL = _LEVELS.get(LOG_LEVEL, 20)
+# Einmal berechnet: Aufrufer prüfen diese Flags, bevor sie f-Strings bauen
+_DEBUG_ENABLED = _LEVEL <= _LEVELS["DEBUG"]
+_WARN_ENABLED = _LEVEL <= _LEVELS["WARN"]
 
 
 def log(level: str, msg: str):
-    if _LEVELS.get(level, 100) >= _lvl():
+    if _LEVELS.get(level, 100) >= _LEVEL:
         print(f"{_ICONS.get(level,'')} {msg}")
 
 
@@ -117,24 +125,81 @@ def ensure_parent(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+# Alle Ausschluss-Muster als eine Alternation: ein C-Aufruf statt P Teilstring-Tests
+# (leere Liste => "(?!)", matcht nie)
+_EXCLUDE_RE = re.compile(
+    "|".join(re.escape(p) for p in EXCLUDE_PATTERNS) or "(?!)"
+)
+
+
 def should_skip_dir(rel_dir: str) -> bool:
     rel = rel_dir.replace("\\", "/")
-    for pat in EXCLUDE_PATTERNS:
-        if pat in rel:
-            warn(f"Ausgeschlossener Ordner: {rel} (Grund: '{pat}')")
-            return True
-    return False
+    m = _EXCLUDE_RE.search(rel)
+    if m is None:
+        return False
+    if _DEBUG_ENABLED:
+        dbg(f"Ausgeschlossener Ordner: {rel} (Grund: '{m.group(0)}')")
+    return True
+
+
+# Muster ohne "/" treffen einen Ordner schon dann, wenn sein Name exakt passt.
+# Solche Ordner werden bereits beim Elternordner aussortiert und nie betreten.
+_EXCLUDE_BASENAMES = frozenset(p for p in EXCLUDE_PATTERNS if "/" not in p)
+
+
+def is_excluded_dirname(name: str, rel_path: str) -> bool:
+    if name not in _EXCLUDE_BASENAMES:
+        return False
+    if _DEBUG_ENABLED:
+        dbg(f"Ausgeschlossener Ordner: {rel_path} (Grund: '{name}')")
+    return True
+
+
+def _suffix(fname: str) -> str:
+    # Wie Path(fname).suffix.lower(), aber ohne Path-Objekt pro Datei
+    dot = fname.rfind(".")
+    return fname[dot:].lower() if dot > 0 else ""
 
 
-def is_excluded_file(filepath_or_name: str) -> bool:
-    fname = os.path.basename(filepath_or_name)
-    return fname in EXCLUDE_FILES
+# Endungsfilter als ein regulärer Ausdruck: "Name mit erlaubter Endung?"
+# in einem C-Aufruf (gleichwertig zu _suffix(fname) in EXTENSIONS).
+_ACCEPT_RE = re.compile(
+    r".+\.(?:%s)" % "|".join(re.escape(ext[1:]) for ext in sorted(EXTENSIONS))
+    if EXTENSIONS
+    else "(?!)",
+    re.IGNORECASE | re.DOTALL | re.ASCII,
+)
+
+
+# Include-Patterns einmalig übersetzen. Wie fnmatch.fnmatch wird über
+# os.path.normcase verglichen (unter Windows case-insensitiv).
+_INCLUDE_RES = {
+    pat: re.compile(fnmatch.translate(os.path.normcase(pat)))
+    for pat in INCLUDE_PATTERNS
+}
+_INCLUDE_RE = re.compile(
+    "|".join(f"(?:{rx.pattern})" for rx in _INCLUDE_RES.values()) or "(?!)"
+)
+
+
+def _include_dir_prefixes(patterns: Iterable[str]) -> frozenset[str]:
+    # Alle Verzeichnis-Präfixe der Patterns ("src", "src/lib", …): ein Ordner
+    # ist relevant, wenn ein Pattern mit "<ordner>/" beginnt.
+    prefixes = set()
+    for pat in patterns:
+        for i, ch in enumerate(pat):
+            if ch in "/\\":
+                prefixes.add(pat[:i])
+    return frozenset(prefixes)
+
+
+_INCLUDE_DIR_PREFIXES = _include_dir_prefixes(INCLUDE_PATTERNS)
 
 
 def matches_include_patterns(rel_path: str) -> bool:
     if not INCLUDE_PATTERNS:
         return True
-    return any(fnmatch.fnmatch(rel_path, pat) for pat in INCLUDE_PATTERNS)
+    return _INCLUDE_RE.match(os.path.normcase(rel_path)) is not None
 
 
 def is_dir_relevant(rel_dir: str) -> bool:
@@ -143,17 +208,17 @@ def is_dir_relevant(rel_dir: str) -> bool:
     rel_dir = rel_dir.rstrip("/\\")
     if rel_dir in ("", "."):
         return True
-    for pat in INCLUDE_PATTERNS:
-        if fnmatch.fnmatch(rel_dir, pat):
-            return True
-        if pat.startswith(rel_dir + "/") or pat.startswith(rel_dir + "\\"):
-            return True
-    return False
+    if rel_dir in _INCLUDE_DIR_PREFIXES:
+        return True
+    return _INCLUDE_RE.match(os.path.normcase(rel_dir)) is not None
 
 
-def list_dir_safe(path: Path) -> Iterable[Path]:
+def list_dir_safe(path: str) -> List[os.DirEntry]:
+    # os.scandir statt Path.iterdir: DirEntry kennt den Typ bereits aus dem
+    # Verzeichnis-Listing, is_dir() braucht dann keinen eigenen stat-Aufruf.
     try:
-        return list(path.iterdir())
+        with os.scandir(path) as it:
+            return list(it)
     except PermissionError:
         warn(f"Kein Zugriff auf: {path}")
         return []
@@ -163,50 +228,73 @@ def log_excluded_file(rel_path: str, reason: str):
     warn(f"Ausgeschlossene Datei: {rel_path} (Grund: {reason})")
 
 
+def _noop(*_args, **_kwargs):
+    pass
+
+
+# Wird WARN nicht ausgegeben, entfallen Aufruf und f-String komplett
+if not _WARN_ENABLED:
+    log_excluded_file = _noop
+
+
 # =========================
 # Verzeichnisstruktur
 # =========================
 def build_tree_lines(start_dir: Path, include_all_files: bool) -> list[str]:
     lines: list[str] = []
-
-    def walk(current_dir: Path, level: int):
-        rel_dir = os.path.relpath(current_dir, start_dir).replace("\\", "/")
-        if rel_dir == ".":
-            rel_dir = ""
-        if rel_dir and not is_dir_relevant(rel_dir):
-            dbg(f"Irrelevant (Include): {rel_dir}")
-            return
+    # Ohne Include-Patterns und mit allen Dateien entfällt jede Pattern-Prüfung
+    check_includes = bool(INCLUDE_PATTERNS)
+    fast = include_all_files and not check_includes
+    # Expliziter Stack statt Rekursion: (Ordner, relativer Pfad, Ebene).
+    # Der relative Pfad wird mitgeführt statt per os.path.relpath berechnet.
+    stack: list[tuple[str, str, int]] = [(os.fspath(start_dir), "", 0)]
+
+    while stack:
+        current_dir, rel_dir, level = stack.pop()
+        if rel_dir and check_includes and not is_dir_relevant(rel_dir):
+            if _DEBUG_ENABLED:
+                dbg(f"Irrelevant (Include): {rel_dir}")
+            continue
         if rel_dir and should_skip_dir(rel_dir):
-            return
+            continue
 
         entries = list_dir_safe(current_dir)
+        rel_prefix = rel_dir + "/" if rel_dir else ""
+        # Sortierschlüssel (casefold) einmal beim Einsammeln berechnen und als
+        # (Schlüssel, Name, Eintrag) ablegen; sortiert wird per itemgetter.
         dirs, files = [], []
         for e in entries:
-            rel_path = os.path.relpath(e, start_dir).replace("\\", "/")
-            if e.is_dir():
-                dirs.append(e)
+            name = e.name
+            rel_path = rel_prefix + name
+            if e.is_dir(follow_symlinks=False):
+                if not is_excluded_dirname(name, rel_path):
+                    dirs.append((name.casefold(), name, e))
             else:
-                if is_excluded_file(e.name):
+                if name in EXCLUDE_FILES:
                     log_excluded_file(rel_path, "Dateiname in EXCLUDE_FILES")
                     continue
-                if include_all_files or e.suffix.lower() in EXTENSIONS:
+                if fast:
+                    files.append((name.casefold(), name))
+                elif include_all_files or _suffix(name) in EXTENSIONS:
                     if matches_include_patterns(rel_path):
-                        files.append(e)
+                        files.append((name.casefold(), name))
                     else:
                         log_excluded_file(rel_path, "kein Treffer in INCLUDE_PATTERNS")
 
-        dirs.sort(key=lambda p: p.name.casefold())
-        files.sort(key=lambda p: p.name.casefold())
+        by_key = itemgetter(0)
+        dirs.sort(key=by_key)
+        files.sort(key=by_key)
 
-        if current_dir != start_dir:
-            lines.append(f"{'  '*level}* {current_dir.name}")
-        file_level = level if current_dir == start_dir else level + 1
-        for f in files:
-            lines.append(f"{'  '*file_level}* {f.name}")
-        for d in dirs:
-            walk(d, level + 1 if current_dir != start_dir else level)
+        # Die Kinder des Startordners stehen auf derselben Ebene wie er selbst
+        child_level = level + 1 if rel_dir else level
+        if rel_dir:
+            lines.append(f"{'  '*level}* {rel_dir.rpartition('/')[2]}")
+        for _, name in files:
+            lines.append(f"{'  '*child_level}* {name}")
+        # Umgekehrt auflegen, damit der erste Ordner als nächstes dran ist
+        for _, name, d in reversed(dirs):
+            stack.append((d.path, rel_prefix + name, child_level))
 
-    walk(start_dir, 0)
     return lines
 
 
@@ -225,43 +313,159 @@ def write_tree(start_dir: Path, output_file: Path, include_all_files: bool = Fal
 # =========================
 # Bundling
 # =========================
-def scan_target_files(start_dir: Path) -> tuple[List[str], Dict[str, bool]]:
-    targets: List[str] = []
-    matched: Dict[str, bool] = {pat: False for pat in INCLUDE_PATTERNS}
-
-    for dirpath, dirnames, filenames in os.walk(start_dir):
-        rel_dir = os.path.relpath(dirpath, start_dir).replace("\\", "/")
-        if rel_dir == ".":
-            rel_dir = ""
-        if not is_dir_relevant(rel_dir):
-            dirnames[:] = []
+_FILE_HEADER = b"// File: %s\n"
+_BLOCK_END = b"\n"  # Leerzeile nach jedem Block
+_BLOCK_END_NO_NL = b"\n\n"  # dito, falls die Datei ohne Zeilenumbruch endet
+_WRITE_BUFFER = 1 << 20  # viele kleine Dateien => wenige große write-Syscalls
+_READ_WORKERS = 8
+_READ_AHEAD = 64  # max. Anzahl vorgelesener Dateien im Speicher
+_PARALLEL_READ_MIN_FILES = 256  # darunter lohnt der Thread-Pool nicht
+
+# Große Dateien per os.sendfile direkt im Kernel anhängen. Nur Linux kann in eine
+# reguläre Datei senden (macOS/BSD nur in Sockets, Windows gar nicht).
+_CAN_SENDFILE = sys.platform.startswith("linux")
+_SENDFILE_MIN_SIZE = 1 << 20
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    # None => Datei ist groß genug für sendfile und wird nicht gelesen
+    with open(path, "rb") as f:
+        if _CAN_SENDFILE and os.fstat(f.fileno()).st_size >= _SENDFILE_MIN_SIZE:
+            return None
+        return f.read()
+
+
+def _sendfile_into(out_fd: int, path: str) -> bool:
+    # Kopiert die Datei ohne Umweg über Python-Puffer ans Ende von out_fd.
+    # Rückgabe: endet die Datei mit einem Zeilenumbruch?
+    in_fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(in_fd).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if sent == 0:  # Datei wurde währenddessen gekürzt
+                break
+            offset += sent
+        return offset > 0 and os.pread(in_fd, 1, offset - 1) == b"\n"
+    finally:
+        os.close(in_fd)
+
+
+def read_ahead(paths: List[str]) -> Iterator[Optional[bytes]]:
+    # Liest Dateien parallel vor (read() gibt die GIL frei), liefert die
+    # Inhalte aber in Eingabereihenfolge. Das Fenster begrenzt den Speicher.
+    if len(paths) <= _PARALLEL_READ_MIN_FILES:
+        for p in paths:
+            yield _read_bytes(p)
+        return
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as ex:
+        remaining = iter(paths)
+        pending = deque(
+            ex.submit(_read_bytes, p) for p in islice(remaining, _READ_AHEAD)
+        )
+        while pending:
+            data = pending.popleft().result()
+            nxt = next(remaining, None)
+            if nxt is not None:
+                pending.append(ex.submit(_read_bytes, nxt))
+            yield data
+
+
+# (Sortierschlüssel, relativer Pfad mit "/", Dateipfad)
+Target = tuple[str, str, str]
+
+_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_PARALLEL_MIN_TOP_DIRS = 4  # erst ab mehr als 4 Top-Level-Ordnern parallel
+
+
+def _scan_dir(
+    dirpath: str,
+    rel_dir: str,
+    dirnames: List[str],
+    filenames: List[str],
+    targets: List[Target],
+    matched: set[str],
+):
+    # Verarbeitet einen os.walk-Eintrag; kürzt dirnames in-place.
+    if not is_dir_relevant(rel_dir) or should_skip_dir(rel_dir):
+        dirnames[:] = []
+        return
+
+    # Nur Strings im Hot-Loop – keine Path-Objekte pro Datei
+    rel_prefix = rel_dir + "/" if rel_dir else ""
+    dirnames[:] = [
+        d for d in dirnames if not is_excluded_dirname(d, rel_prefix + d)
+    ]
+    for fname in filenames:
+        rel_path = rel_prefix + fname
+
+        if fname in EXCLUDE_FILES:
+            log_excluded_file(rel_path, "Dateiname in EXCLUDE_FILES")
             continue
-        if should_skip_dir(rel_dir):
-            dirnames[:] = []
+        if _ACCEPT_RE.fullmatch(fname) is None:
+            log_excluded_file(rel_path, "Dateiendung nicht in EXTENSIONS")
+            continue
+        if not matches_include_patterns(rel_path):
+            log_excluded_file(rel_path, "kein Treffer in INCLUDE_PATTERNS")
             continue
 
-        for fname in filenames:
-            filepath = os.path.join(dirpath, fname)
-            rel_path = os.path.relpath(filepath, start_dir).replace("\\", "/")
-
-            if not Path(fname).suffix.lower() in EXTENSIONS:
-                log_excluded_file(rel_path, "Dateiendung nicht in EXTENSIONS")
-                continue
-            if is_excluded_file(fname):
-                log_excluded_file(rel_path, "Dateiname in EXCLUDE_FILES")
-                continue
-            if not matches_include_patterns(rel_path):
-                log_excluded_file(rel_path, "kein Treffer in INCLUDE_PATTERNS")
-                continue
-
-            for pat in INCLUDE_PATTERNS:
-                if fnmatch.fnmatch(rel_path, pat):
-                    matched[pat] = True
-            targets.append(filepath)
-
+        rel_norm = os.path.normcase(rel_path)
+        for pat, rx in _INCLUDE_RES.items():
+            if pat not in matched and rx.match(rel_norm):
+                matched.add(pat)
+        filepath = os.path.join(dirpath, fname)
+        targets.append((rel_path.casefold(), rel_path, filepath))
+
+
+def _scan_walk(
+    walk: Iterable[tuple[str, List[str], List[str]]], cut: int
+) -> tuple[List[Target], set[str]]:
+    targets: List[Target] = []
+    matched: set[str] = set()
+    for dirpath, dirnames, filenames in walk:
+        rel_dir = dirpath[cut:].replace("\\", "/")
+        _scan_dir(dirpath, rel_dir, dirnames, filenames, targets, matched)
     return targets, matched
 
 
+def scan_target_files(start_dir: Path) -> tuple[List[Target], Dict[str, bool]]:
+    # os.walk liefert dirpath immer mit start_dir als Präfix – abschneiden
+    # statt os.path.relpath pro Verzeichnis.
+    cut = len(os.path.join(os.fspath(start_dir), ""))
+    walk = os.walk(start_dir, followlinks=False)
+    root = next(walk, None)
+    if root is None:
+        return [], {pat: False for pat in INCLUDE_PATTERNS}
+
+    targets: List[Target] = []
+    matched: set[str] = set()
+    root_path, top_dirs, root_files = root
+    _scan_dir(root_path, "", top_dirs, root_files, targets, matched)
+
+    if len(top_dirs) > _PARALLEL_MIN_TOP_DIRS:
+        # Jeder Top-Level-Ordner wird in einem eigenen Thread durchlaufen; scandir
+        # gibt die GIL frei, Latenz (z.B. Netzlaufwerk) überlappt sich.
+        # os.walk(top) folgt top selbst auch als Symlink – die ausfiltern, wie es
+        # followlinks=False für alle tieferen Ordner tut.
+        tops = [os.path.join(root_path, d) for d in top_dirs]
+        tops = [top for top in tops if not os.path.islink(top)]
+        with ThreadPoolExecutor(max_workers=_WALK_WORKERS) as ex:
+            results = ex.map(
+                lambda top: _scan_walk(os.walk(top, followlinks=False), cut), tops
+            )
+            for sub_targets, sub_matched in results:
+                targets.extend(sub_targets)
+                matched |= sub_matched
+    else:
+        # os.walk setzt mit den (gekürzten) top_dirs seriell fort
+        sub_targets, sub_matched = _scan_walk(walk, cut)
+        targets.extend(sub_targets)
+        matched |= sub_matched
+
+    return targets, {pat: pat in matched for pat in INCLUDE_PATTERNS}
+
+
 def bundle_files(start_dir: Path, output_file: Path):
     ensure_parent(output_file)
     if output_file.exists():
@@ -274,19 +478,24 @@ def bundle_files(start_dir: Path, output_file: Path):
             warn(f"Keine Dateien für Include-Pattern '{pat}' gefunden.")
 
     info(f"{_ICONS['ARROW']} Insgesamt {len(targets)} Datei(en) zum Bündeln.")
-    with open(output_file, "w", encoding="utf-8") as out:
-        for fp in sorted(
-            targets, key=lambda p: os.path.relpath(p, start_dir).casefold()
-        ):
-            rel = os.path.relpath(fp, start_dir).replace("\\", "/")
-            info(f"{_ICONS['OK']} Verarbeite: {rel}")
-            out.write(f"// File: {rel}\n")
-            with open(fp, encoding="utf-8") as f:
-                content = f.read()
-            out.write(content)
-            if not content.endswith("\n"):
-                out.write("\n")
-            out.write("\n")
+    # Binär kopieren: Inhalte werden unverändert übernommen, ohne
+    # UTF-8-Decode/Encode-Rundreise über Python-Strings.
+    # Ein Sortierlauf nach dem beim Scannen berechneten Schlüssel; der
+    # relative Pfad wird mitgeführt statt erneut berechnet.
+    targets.sort(key=itemgetter(0))
+    contents = read_ahead([fp for _, _, fp in targets])
+    with open(output_file, "wb", buffering=_WRITE_BUFFER) as out:
+        for (_, rel, fp), content in zip(targets, contents):
+            if _DEBUG_ENABLED:
+                dbg(f"{_ICONS['OK']} Verarbeite: {rel}")
+            out.write(_FILE_HEADER % rel.encode("utf-8"))
+            if content is None:
+                out.flush()
+                ends_with_newline = _sendfile_into(out.fileno(), fp)
+            else:
+                out.write(content)
+                ends_with_newline = content.endswith(b"\n")
+            out.write(_BLOCK_END if ends_with_newline else _BLOCK_END_NO_NL)
     info(f"{_ICONS['OK']} Erfolgreich alle Dateien in '{output_file}' gebündelt.")
 
 
@@ -294,6 +503,12 @@ def bundle_files(start_dir: Path, output_file: Path):
 # main
 # =========================
 def main():
+    # Blockweise puffern statt pro Zeile flushen – Log-Zeilen im Hot-Path
+    # kosten sonst je einen write-Syscall.
+    reconfigure = getattr(sys.stdout, "reconfigure", None)
+    if reconfigure is not None:
+        reconfigure(line_buffering=False)
+
     print("--- Zusammenfassung ---")
     print(f"LOG_LEVEL: {LOG_LEVEL}")
     print(f"Quell-Startverzeichnis: {START_DIR}")
@@ -301,7 +516,7 @@ def main():
     print(f"Tree-Ausgabedatei: {TREE_OUTPUT_FILE}")
     print(f"Include-Patterns: {INCLUDE_PATTERNS or '[keine => alles]'}")
     print(f"Ausgeschlossene Verzeichnisse: {EXCLUDE_PATTERNS}")
-    print(f"Ausgeschlossene Dateien: {EXCLUDE_FILES}")
+    print(f"Ausgeschlossene Dateien: {sorted(EXCLUDE_FILES)}")
     print("-----------------------")
 
     if not START_DIR.exists():
@@ -1,53 +1,193 @@
 ﻿#!/usr/bin/env python3
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import mmap
+import os
 import re
+import sys
 
 # --- Configuration ---
 BASE_DIR   = Path(__file__).parent.parent.resolve() / "generate_files" / "generated"
 INPUT_FILE = BASE_DIR / "input.txt"
 OUTPUT_DIR = BASE_DIR 
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-# Matches lines like: // File: Core/Models/Enums.cs
-FILE_PATTERN = re.compile(r"^\s*//\s*File:\s*(.+)$")
+# Matches marker lines like: // File: Core/Models/Enums.cs
+# Only run on lines that contain MARKER_NEEDLE, from the start of the line.
+# [ \t\r\f\v] is whitespace that stays within the marker line. The path is
+# captured already trimmed (incl. a trailing \r); a marker with only
+# whitespace after "File:" still matches, but with no path (group 1 is None).
+MARKER_NEEDLE = b"File:"
+_HWS = rb"[ \t\r\f\v]"
+FILE_PATTERN = re.compile(
+    rb"(?m)^%s*//%s*File:%s*(?:(\S.*?)|%s)%s*(?:\n|$)" % ((_HWS,) * 5)
+)
 
-def split_by_marker(input_file: Path, output_base: Path):
-    lines = input_file.read_text(encoding="utf-8").splitlines(keepends=True)
-    current_path = None
-    buffer = []
+# Raw binary writes; O_BINARY keeps Windows from translating newlines
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
 
-    for raw in lines:
-        # Remove linebreaks for matching
-        line = raw.rstrip("\r\n")
-        m = FILE_PATTERN.match(line)
-        if m:
-            # New file block: flush previous
-            if current_path and buffer:
-                write_block(output_base, current_path, buffer)
-            # Extract relative path and reset buffer
-            current_path = m.group(1).strip()
-            buffer = []
+# Linux can copy file-to-file inside the kernel (os.sendfile into a regular
+# file); elsewhere sendfile needs a socket, so the bodies are written instead
+_USE_SENDFILE = sys.platform.startswith("linux")
+
+# Output sizes are known up front: reserve the space in one go (POSIX only)
+_HAS_FALLOCATE = hasattr(os, "posix_fallocate")
+
+def split_by_marker(input_file: Path, output_base: Path, verbose: bool = False):
+    # Bytes throughout: the bodies are written back exactly as read, only the
+    # marker paths get decoded. The input is memory-mapped rather than read:
+    # no copy into a Python object, and the pages come from the page cache.
+    with open(input_file, "rb") as src:
+        if os.fstat(src.fileno()).st_size == 0:
+            written, unchanged = [], 0
         else:
-            # Inside a file block, collect content
-            if current_path:
-                buffer.append(raw)
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                written, unchanged = _write_blocks(src.fileno(), data, output_base)
+
+    # One write for the whole listing instead of a print() per file
+    if verbose:
+        sys.stdout.write("".join(f"✔ Wrote {path}\n" for path in written))
+    print(f"✔ Wrote {len(written)} file(s) to {output_base} ({unchanged} unchanged)")
 
-    # Flush final block
-    if current_path and buffer:
-        write_block(output_base, current_path, buffer)
 
+def _write_blocks(
+    src_fd: int, data: mmap.mmap, output_base: Path
+) -> tuple[list[str], int]:
+    # Returns the paths actually written and the number of unchanged files
+    # A file may appear in several blocks (also spelled differently, e.g.
+    # "d//f.txt" or "./d/f.txt"); written in order, the last one wins. Keep
+    # only that one, otherwise parallel writers would race on the file.
+    last_block = {
+        _file_key(path): (path, start, end) for path, start, end in scan_blocks(data)
+    }
+    blocks = list(last_block.values())
 
-def write_block(output_base: Path, relative_path: str, chunk: list[str]):
-    out_path = output_base / relative_path
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    # Write the collected lines to the output file
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.writelines(chunk)
-    print(f"✔ Wrote {out_path.relative_to(BASE_DIR)}")
+    # The output files are independent and writing them is mostly waiting on
+    # open/write/close, which releases the GIL - so write them in parallel.
+    # list() re-raises the first error from a worker.
+    base_dir = os.fspath(output_base)
+    copy_fd = src_fd if _USE_SENDFILE else None
+    # Parent directories already created during this run (not kept across
+    # runs: the output tree may have been removed in between)
+    created_dirs: set[str] = set()
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as ex:
+        results = list(
+            ex.map(
+                lambda block: write_block(
+                    base_dir, *block, data, created_dirs, src_fd=copy_fd
+                ),
+                blocks,
+            )
+        )
+    written = [path for (path, _, _), wrote in zip(blocks, results) if wrote]
+    return written, len(blocks) - len(written)
+
+
+def _file_key(relative_path: str) -> str:
+    # Same key for every spelling of the same output file
+    if os.sep != "/":
+        relative_path = relative_path.replace("/", os.sep)
+    return os.path.normcase(os.path.normpath(relative_path))
+
+
+def scan_blocks(data: mmap.mmap) -> list[tuple[str, int, int]]:
+    # Single pass over the input, returns (path, body start, body end) for
+    # every block that gets written. Each body runs from the end of its marker
+    # line to the start of the next marker; anything before the first marker,
+    # empty bodies and markers without a path are dropped.
+    # The marker contains a fixed literal, so the scan is find() (C-level
+    # substring search); the regex only runs on the few lines containing it.
+    blocks = []
+    path, body_start = None, 0
+    pos = data.find(MARKER_NEEDLE)
+    while pos != -1:
+        line_start = data.rfind(b"\n", 0, pos) + 1
+        line_end = data.find(b"\n", pos) + 1 or len(data)
+        m = FILE_PATTERN.match(data, line_start, line_end)
+        if m:
+            if path and line_start > body_start:
+                blocks.append((path.decode("utf-8"), body_start, line_start))
+            path, body_start = m.group(1), m.end()
+        pos = data.find(MARKER_NEEDLE, line_end)
+    if path and len(data) > body_start:
+        blocks.append((path.decode("utf-8"), body_start, len(data)))
+    return blocks
+
+
+def write_block(
+    base_dir: str,
+    relative_path: str,
+    start: int,
+    end: int,
+    data: mmap.mmap,
+    created_dirs: set[str],
+    src_fd: Optional[int] = None,
+) -> bool:
+    # The block is data[start:end]. If src_fd (the file behind data) is given,
+    # the kernel copies the range from there with sendfile (positional, so the
+    # writer threads can share the fd). Returns False if the file already had
+    # exactly this content and was left alone.
+    # Plain string paths: no PurePath parsing per output file
+    if os.sep != "/":
+        relative_path = relative_path.replace("/", os.sep)
+    out_path = base_dir + os.sep + relative_path
+    if _is_unchanged(out_path, data, start, end):
+        return False
+    # Many files share a parent: create each directory only once. Safe across
+    # writer threads - at worst two threads both call makedirs(exist_ok=True).
+    parent = os.path.dirname(out_path)
+    if parent not in created_dirs:
+        os.makedirs(parent, exist_ok=True)
+        created_dirs.add(parent)
+    # No text/buffer layers: one sendfile or write() for the whole block
+    fd = os.open(out_path, _OPEN_FLAGS, 0o644)
+    try:
+        if _HAS_FALLOCATE:
+            try:
+                os.posix_fallocate(fd, 0, end - start)
+            except OSError:
+                pass  # Not supported by this filesystem - just write
+        if src_fd is not None:
+            while start < end:
+                sent = os.sendfile(fd, src_fd, start, end - start)
+                if sent == 0:
+                    raise OSError(f"Input ended early while writing {out_path}")
+                start += sent
+        else:
+            # Released right away, otherwise the mmap could not be closed
+            with memoryview(data) as view:
+                while start < end:
+                    start += os.write(fd, view[start:end])
+    finally:
+        os.close(fd)
+    return True
+
+
+def _is_unchanged(out_path: str, data: mmap.mmap, start: int, end: int) -> bool:
+    # A stat is enough to rule out most changes (missing file, other size);
+    # only same-sized files get compared byte by byte.
+    try:
+        if os.stat(out_path).st_size != end - start:
+            return False
+        with open(out_path, "rb") as f:
+            existing = f.read()
+    except FileNotFoundError:
+        return False
+    with memoryview(data) as view:
+        return view[start:end] == existing
 
 if __name__ == "__main__":
+    # Block-buffer stdout instead of flushing after every line (a TTY is
+    # line-buffered); everything is flushed once when the script exits.
+    reconfigure = getattr(sys.stdout, "reconfigure", None)
+    if reconfigure is not None:
+        reconfigure(line_buffering=False, write_through=False)
+
     if not INPUT_FILE.is_file():
         print(f"✖ Input file '{INPUT_FILE}' not found.")
         exit(1)
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    split_by_marker(INPUT_FILE, OUTPUT_DIR)
+    verbose = "-v" in sys.argv[1:] or "--verbose" in sys.argv[1:]
+    split_by_marker(INPUT_FILE, OUTPUT_DIR, verbose=verbose)